@@ -6,10 +6,14 @@ with integrated voice and text input capabilities.
 """
 
 import streamlit as st
-import backend as backend  # Custom backend module for AI and database operations
 import requests
+from requests.adapters import HTTPAdapter
 import re
+from html import escape
+from datetime import datetime
+from functools import lru_cache
 import time as time_module
+from concurrent.futures import ThreadPoolExecutor
 
 # =============================================================================
 # DEPENDENCIES AND SAFE IMPORTS
@@ -23,6 +27,20 @@ except ImportError:
     HAS_LOTTIE = False
     st.warning("Lottie animations disabled - install streamlit-lottie for enhanced visuals")
 
+@st.cache_resource
+def get_backend():
+    """
+    Import and initialize the backend once per process, on first use.
+    Pages that never touch the database or AI skip the import entirely,
+    and the schema setup runs once instead of on every import.
+    
+    Returns:
+        module: Custom backend module for AI and database operations
+    """
+    import backend
+    backend.init_db()
+    return backend
+
 # =============================================================================
 # PAGE CONFIGURATION
 # =============================================================================
@@ -38,46 +56,76 @@ st.set_page_config(
 # ASSET LOADING FUNCTIONS
 # =============================================================================
 
-def load_lottieurl(url):
+# Lottie animation sources for the dashboard and creation pages
+LOTTIE_AI_URL = "https://assets3.lottiefiles.com/packages/lf20_3rwasyjy.json"
+LOTTIE_CHAT_URL = "https://assets1.lottiefiles.com/packages/lf20_uxikzyqy.json"
+
+# (connect, read) timeouts in seconds so a hung CDN can't stall startup
+LOTTIE_TIMEOUT = (2, 4)
+
+@st.cache_resource
+def _session():
     """
-    Load Lottie animation from URL with error handling.
+    Create a shared HTTP session with keep-alive for asset downloads.
+    
+    Returns:
+        requests.Session: Session reused across reruns and user sessions
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=2)
+    session.mount("https://", adapter)
+    return session
+
+def _fetch_lottie(session, url):
+    """
+    Download a Lottie animation JSON without touching Streamlit's cache.
+    Safe to call from worker threads.
     
     Args:
+        session (requests.Session): HTTP session to send the request with
         url (str): URL to Lottie animation JSON
         
     Returns:
         dict: Lottie animation data or None if loading fails
     """
-    if not HAS_LOTTIE:
-        return None
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
+        response = session.get(url, timeout=LOTTIE_TIMEOUT)
+        if not response.ok:
             return None
         return response.json()
     except Exception:
         return None
 
-# Load dark-themed animations for enhanced UI
-lottie_ai = None
-lottie_chat = None
-if HAS_LOTTIE:
-    lottie_ai = load_lottieurl(
-        "https://assets3.lottiefiles.com/packages/lf20_3rwasyjy.json"
-    )
-    lottie_chat = load_lottieurl(
-        "https://assets1.lottiefiles.com/packages/lf20_uxikzyqy.json"
-    )
+@st.cache_resource(ttl=86400, show_spinner=False)
+def get_animations():
+    """
+    Load both dark-themed animations with a single cache lookup.
+    The two downloads run in parallel so a cold start waits for the
+    slower request only, not the sum of both. The parsed JSON is shared
+    rather than copied, so a rerun does not unpickle it again.
+    
+    Returns:
+        tuple: (lottie_ai, lottie_chat) animation data, None where unavailable
+    """
+    if not HAS_LOTTIE:
+        return None, None
+    session = _session()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        lottie_ai, lottie_chat = executor.map(
+            lambda url: _fetch_lottie(session, url),
+            [LOTTIE_AI_URL, LOTTIE_CHAT_URL]
+        )
+    return lottie_ai, lottie_chat
 
 # =============================================================================
 # CUSTOM CSS STYLING - DARK THEME
 # =============================================================================
 
-st.markdown(
-    """
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
+# Inter font is preloaded via <link> so the fetch doesn't block first paint
+FONT_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap"
 
+CSS_STYLES = """
+<style>
     * {
         font-family: 'Inter', sans-serif;
     }
@@ -191,6 +239,21 @@ st.markdown(
         position: relative;
     }
 
+    /* Native chat message and chat input styling */
+    [data-testid="stChatMessage"] {
+        background: rgba(30, 30, 46, 0.9);
+        color: #e0e0e0;
+        border-radius: 20px;
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
+    }
+
+    [data-testid="stChatInput"] {
+        background: rgba(20, 20, 30, 0.8);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 12px;
+    }
+
     /* Form input styling */
     .stTextInput > div > div > input {
         background: rgba(20, 20, 30, 0.8);
@@ -336,42 +399,685 @@ st.markdown(
         text-align: center;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
-
-# =============================================================================
-# SESSION STATE MANAGEMENT
-# =============================================================================
+"""
 
-# Initialize session state variables for app navigation and data persistence
-if "page" not in st.session_state:
-    st.session_state.page = "home"  # Current page: "home", "create", or "chat"
+# Patterns for minifying the stylesheet before it is sent to the browser
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,])\s*")
 
-if "current_survey" not in st.session_state:
-    st.session_state.current_survey = None  # Currently active survey ID
+def _minify_css(css):
+    """
+    Strip comments and redundant whitespace from a stylesheet.
+    Spaces are only dropped around braces, semicolons and commas, so
+    descendant selectors keep their meaning.
+    
+    Args:
+        css (str): Stylesheet markup
+        
+    Returns:
+        str: Minified stylesheet markup
+    """
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    return _CSS_PUNCT_RE.sub(r"\1", css).strip()
 
-if "messages" not in st.session_state:
-    st.session_state.messages = {}  # Cache for conversation messages
+@st.cache_resource
+def _css_blob():
+    """
+    Build the static font links and minified stylesheet once per process.
+    
+    Returns:
+        str: HTML markup ready to be injected with st.markdown
+    """
+    font_links = (
+        f'<link rel="preload" as="style" href="{FONT_URL}">'
+        f'<link rel="stylesheet" href="{FONT_URL}">'
+    )
+    return font_links + _minify_css(CSS_STYLES)
 
-if "audio_data" not in st.session_state:
-    st.session_state.audio_data = None  # Store recorded audio data
+# Streamlit clears elements that are not re-emitted on a rerun, so the style
+# node is still sent every run; the cached blob keeps markup building off it
+st.markdown(_css_blob(), unsafe_allow_html=True)
 
-if "survey_created" not in st.session_state:
-    st.session_state.survey_created = False  # Track survey creation success
+# =============================================================================
+# SESSION STATE MANAGEMENT
+# =============================================================================
 
-if "create_form_submitted" not in st.session_state:
-    st.session_state.create_form_submitted = False  # Form submission state
+# Default session state for app navigation and data persistence
+SESSION_DEFAULTS = {
+    "page": "home",                   # Current page: "home", "create", or "chat"
+    "current_survey": None,           # Currently active survey ID
+    "audio_data": None,               # Store recorded audio data
+    "survey_created": False,          # Track survey creation success
+    "create_form_submitted_at": 0.0,  # Last accepted form submit (monotonic)
+    "pending_input": None,            # Text response queued by the chat input
+    "pending_voice": False,           # Whether the recording was queued for sending
+    "show_all": False,                # Render the full transcript instead of the window
+    "transcription": None,            # Background transcription of audio_data
+    "delete_pending": None,           # Survey awaiting delete confirmation
+}
+
+# Initialize everything in one update on the first run of a session
+if "_initialized" not in st.session_state:
+    st.session_state.update(SESSION_DEFAULTS)
+    st.session_state.messages = {}  # Cache for conversation messages (fresh per session)
+    st.session_state._initialized = True
+
+# Repeat create-form submits within this window are ignored
+CREATE_DEBOUNCE_SECONDS = 0.5
+
+def accept_create_submit():
+    """
+    Debounce the survey creation form against double-clicks.
+    
+    Returns:
+        bool: True for a fresh submit, False for a repeat within the window
+    """
+    now = time_module.monotonic()
+    if now - st.session_state.create_form_submitted_at < CREATE_DEBOUNCE_SECONDS:
+        return False
+    st.session_state.create_form_submitted_at = now
+    return True
 
 def navigate(page):
     """
     Navigate between different pages of the application.
+    Meant to be used as a widget on_click callback: Streamlit reruns the
+    script right after a callback, so no explicit st.rerun() is needed.
+    Inline callers must call st.rerun() themselves.
     
     Args:
         page (str): Target page identifier ("home", "create", "chat")
     """
     st.session_state.page = page
-    st.rerun()
+
+def start_new_survey():
+    """
+    Reset creation state and open the survey creation page.
+    """
+    st.session_state.survey_created = False
+    navigate("create")
+
+def resume_survey(survey_id):
+    """
+    Select a survey and open its interview page.
+    
+    Args:
+        survey_id (str): The unique survey identifier to resume
+    """
+    st.session_state.current_survey = survey_id
+    st.session_state.show_all = False
+    navigate("chat")
+
+def store_recording():
+    """
+    Keep a finished voice recording for sending and start transcribing it.
+    Runs as the audio widget's on_change callback, so it fires once per
+    new recording rather than on every rerun. Transcription runs in the
+    background while the user decides whether to send.
+    """
+    recording = st.session_state.voice_input
+    st.session_state.audio_data = recording
+    st.session_state.transcription = (
+        get_backend().transcribe_audio_async(recording.getvalue()) if recording else None
+    )
+
+def submit_text():
+    """
+    Queue the chat input's text for processing on the coming rerun.
+    Runs as the chat input's on_submit callback.
+    """
+    answer = st.session_state.text_input
+    if answer and answer.strip():
+        st.session_state.pending_input = answer.strip()
+
+def submit_voice():
+    """
+    Queue the stored voice recording for transcription on the coming rerun.
+    """
+    st.session_state.pending_voice = True
+
+def clear_recording():
+    """
+    Discard the stored voice recording and its pending transcription.
+    """
+    if st.session_state.transcription is not None:
+        st.session_state.transcription.cancel()
+    st.session_state.audio_data = None
+    st.session_state.transcription = None
+
+def request_delete(survey_id):
+    """
+    Ask for confirmation before deleting a survey.
+    
+    Args:
+        survey_id (str): The unique survey identifier to delete
+    """
+    st.session_state.delete_pending = survey_id
+
+def confirm_delete():
+    """
+    Delete the survey awaiting confirmation and clear the selection.
+    """
+    delete_survey(st.session_state.delete_pending)
+    st.session_state.delete_pending = None
+    st.session_state.active_survey_select = None
+
+def cancel_delete():
+    """
+    Keep the survey that was awaiting delete confirmation.
+    """
+    st.session_state.delete_pending = None
+
+def show_full_history():
+    """
+    Expand the chat transcript beyond the most recent messages.
+    """
+    st.session_state.show_all = True
+
+def leave_create():
+    """
+    Reset creation state and return to the dashboard.
+    """
+    st.session_state.survey_created = False
+    navigate("home")
+
+# =============================================================================
+# CACHED DATA ACCESS
+# =============================================================================
+
+# Version key for the survey lists; message keys are ("messages", survey_id)
+SURVEYS_KEY = "surveys"
+
+@st.cache_resource
+def _data_versions():
+    """
+    Process-wide data version counters used as cache keys.
+    Shared by all sessions so a write in one tab invalidates every tab.
+    
+    Returns:
+        dict: Mapping of data key to its current version
+    """
+    return {}
+
+def _version(key):
+    """
+    Get the current version of a piece of cached data.
+    
+    Args:
+        key: SURVEYS_KEY or ("messages", survey_id)
+        
+    Returns:
+        int: Current version, 0 if never written
+    """
+    return _data_versions().get(key, 0)
+
+def _bump_version(key):
+    """
+    Invalidate cached data after a write by moving to a new version.
+    
+    Args:
+        key: SURVEYS_KEY or ("messages", survey_id)
+    """
+    versions = _data_versions()
+    versions[key] = versions.get(key, 0) + 1
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _load_surveys(status, version):
+    """
+    Fetch surveys with a given status, cached per (status, version) pair.
+    
+    Args:
+        status (str): Filter surveys by status ("Incomplete" or "Completed")
+        version (int): Survey list version; a new value forces a fresh fetch
+        
+    Returns:
+        list: List of Survey tuples ordered by creation date (newest first)
+    """
+    return get_backend().get_all_surveys(status)
+
+def get_all_surveys(status):
+    """
+    Get surveys with a given status, hitting the database only after a change.
+    
+    Args:
+        status (str): Filter surveys by status ("Incomplete" or "Completed")
+        
+    Returns:
+        list: List of Survey tuples ordered by creation date (newest first)
+    """
+    return _load_surveys(status, _version(SURVEYS_KEY))
+
+def create_survey(question, probes, length, language):
+    """
+    Create a survey and invalidate the cached survey lists.
+    
+    Args:
+        question (str): The main survey question
+        probes (int): Number of allowed follow-up questions
+        length (int): Expected conversation length
+        language (str): Language for the conversation
+        
+    Returns:
+        str: Unique survey ID for the created survey
+    """
+    survey_id = get_backend().create_survey_record(
+        question=question,
+        probes=probes,
+        length=length,
+        language=language
+    )
+    _bump_version(SURVEYS_KEY)
+    return survey_id
+
+def delete_survey(survey_id):
+    """
+    Delete a survey and invalidate its cached lists and messages.
+    
+    Args:
+        survey_id (str): The unique survey identifier to delete
+    """
+    get_backend().delete_survey_record(survey_id)
+    _bump_version(SURVEYS_KEY)
+    _bump_version(("messages", survey_id))
+
+def complete_survey(survey_id):
+    """
+    Mark a survey as completed and invalidate the cached survey lists.
+    
+    Args:
+        survey_id (str): The unique survey identifier to mark as complete
+    """
+    get_backend().mark_survey_complete(survey_id)
+    _bump_version(SURVEYS_KEY)
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _load_messages(survey_id, version):
+    """
+    Fetch a survey's messages, cached per (survey_id, version) pair.
+    
+    Args:
+        survey_id (str): The unique survey identifier
+        version (int): Message version; a new value forces a fresh fetch
+        
+    Returns:
+        list: List of Message tuples ordered by id
+    """
+    return get_backend().get_messages(survey_id)
+
+class MsgLog:
+    """
+    Struct-of-arrays view of a survey's messages.
+    Parallel role/content/timestamp lists keep slicing and role filtering
+    to plain list operations, with no dict per message.
+    """
+    __slots__ = ("role", "content", "ts")
+
+    def __init__(self):
+        self.role = []
+        self.content = []
+        self.ts = []
+
+    def __len__(self):
+        return len(self.role)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a log from message rows as returned by the backend.
+        
+        Args:
+            rows (list): Message tuples with role/content/timestamp fields
+            
+        Returns:
+            MsgLog: Log holding the rows in order
+        """
+        log = cls()
+        log.role = [row.role for row in rows]
+        log.content = [row.content for row in rows]
+        log.ts = [row.timestamp for row in rows]
+        return log
+
+    def tail(self, n):
+        """
+        Get the most recent messages in the backend's Message shape.
+        Fields the log does not track (id, survey_id, is_audio) are None.
+        
+        Args:
+            n (int): Number of messages to return
+            
+        Returns:
+            list: Up to n Message tuples, oldest first
+        """
+        message = get_backend().Message
+        return [
+            message(None, None, role, content, None, ts)
+            for role, content, ts in zip(self.role[-n:], self.content[-n:], self.ts[-n:])
+        ]
+
+    def last(self, role):
+        """
+        Find the content of the most recent message from a role.
+        
+        Args:
+            role (str): "ai" or "user"
+            
+        Returns:
+            str: Message content, or None if the role has no messages
+        """
+        for i in range(len(self.role) - 1, -1, -1):
+            if self.role[i] == role:
+                return self.content[i]
+        return None
+
+def get_message_log(survey_id):
+    """
+    Get a survey's messages as a MsgLog, memoized in the session.
+    The log is rebuilt only when the survey's message version changes.
+    
+    Args:
+        survey_id (str): The unique survey identifier
+        
+    Returns:
+        MsgLog: The survey's conversation history
+    """
+    version = _version(("messages", survey_id))
+    cached = st.session_state.messages.get(survey_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    log = MsgLog.from_rows(_load_messages(survey_id, version))
+    st.session_state.messages[survey_id] = (version, log)
+    return log
+
+def add_messages(survey_id, messages):
+    """
+    Store messages in one transaction and invalidate the cached history.
+    
+    Args:
+        survey_id (str): The unique survey identifier
+        messages (list): (role, content, is_audio) triples in conversation order
+    """
+    get_backend().add_messages(survey_id, messages)
+    _bump_version(("messages", survey_id))
+
+# =============================================================================
+# RENDERING HELPERS
+# =============================================================================
+
+# Stored messages handed to the AI generator: enough for its recent-context
+# prompt and its repeated-reply check, without copying the whole transcript
+PROMPT_CONTEXT_MESSAGES = 3
+
+# Number of most recent chat messages rendered before "Show earlier messages"
+CHAT_WINDOW = 30
+
+# AI reply stored when generation fails or is cut off before any text arrives;
+# worded so it doesn't match the completion check below
+FALLBACK_REPLY = "Could you tell me a bit more about that?"
+
+# Precompiled pattern for stripping markup from stored AI messages
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+
+# Phrases in an AI message that signal the interview has wrapped up
+_DONE_RE = re.compile(r'thank you|complete|finished|participation', re.I)
+
+def _html_text(text):
+    """
+    Escape message text for safe embedding in bubble HTML.
+    
+    Args:
+        text (str): Raw message text
+        
+    Returns:
+        str: HTML-escaped text with line breaks preserved
+    """
+    return escape(text).replace("\n", "<br>")
+
+@lru_cache(maxsize=1024)
+def format_timestamp(timestamp):
+    """
+    Convert a stored message timestamp to its display form.
+    
+    Args:
+        timestamp (str): Timestamp as stored in the database ("%Y-%m-%d %H:%M:%S")
+        
+    Returns:
+        str: Timestamp formatted as "%m/%d/%y, %I:%M %p", or unchanged if unparseable
+    """
+    try:
+        return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%m/%d/%y, %I:%M %p")
+    except (TypeError, ValueError):
+        return timestamp
+
+def message_html(role, content, timestamp):
+    """
+    Build the HTML for a single conversation message bubble.
+    Markup is kept on one line so markdown never splits the HTML block.
+    
+    Args:
+        role (str): "ai" or "user" - who sent the message
+        content (str): The message content
+        timestamp (str): When the message was stored
+        
+    Returns:
+        str: Bubble HTML for the message
+    """
+    if role == "user":
+        # User message bubble (right-aligned)
+        return (
+            "<div style='display: flex; justify-content: flex-end; margin: 1rem 0;'>"
+            "<div class=\"user-bubble\">"
+            "<div style='font-size: 0.8rem; opacity: 0.7; margin-bottom: 0.5rem;'>You</div>"
+            f"{_html_text(content)}"
+            f"<div class=\"message-time\">{escape(format_timestamp(timestamp))}</div>"
+            "</div></div>"
+        )
+    
+    # AI message bubble (left-aligned)
+    clean_content = _HTML_TAG_RE.sub('', content).strip()
+    return (
+        "<div style='display: flex; align-items: flex-start; margin: 1rem 0;'>"
+        "<div style='font-size: 2rem; margin-right: 0.5rem;'>🤖</div>"
+        "<div class=\"ai-bubble\">"
+        "<div style='font-size: 0.8rem; opacity: 0.7; margin-bottom: 0.5rem;'>AI Interviewer</div>"
+        f"{_html_text(clean_content)}"
+        "</div></div>"
+    )
+
+def render_messages(roles, contents, timestamps):
+    """
+    Render conversation messages with a single markdown call.
+    
+    Args:
+        roles (list): Message roles, "ai" or "user"
+        contents (list): Message contents, parallel to roles
+        timestamps (list): Message timestamps, parallel to roles
+    """
+    st.markdown("".join(map(message_html, roles, contents, timestamps)), unsafe_allow_html=True)
+
+# Leading characters of a survey id shown to tell apart surveys with the same question
+SURVEY_REF_LENGTH = 8
+
+def survey_label(survey):
+    """
+    Build the picker label for a survey.
+    Surveys often share their question, so the label adds the creation
+    time and the short reference printed on the survey's card.
+    
+    Args:
+        survey (Survey): Survey row with id/question/created_at fields
+        
+    Returns:
+        str: Label such as "What do you think of tea? · 2024-05-01 10:00:00 · #1a2b3c4d"
+    """
+    return f"{survey.question} · {survey.created_at} · #{survey.id[:SURVEY_REF_LENGTH]}"
+
+def survey_card_html(survey, completed=False):
+    """
+    Build the dashboard card markup for one survey.
+    
+    Args:
+        survey (Survey): Survey row with question/created_at/probes/length fields
+        completed (bool): Whether to render the completed variant
+        
+    Returns:
+        str: HTML for the survey card
+    """
+    if completed:
+        meta = f"✅ Completed: {survey.created_at} • #{survey.id[:SURVEY_REF_LENGTH]}"
+        badge = '<span class="status-badge status-completed">Completed</span>'
+    else:
+        meta = (
+            f"📍 Created: {survey.created_at} • 🔍 Probes: {survey.probes} • "
+            f"⏱️ Length: {survey.length}s • #{survey.id[:SURVEY_REF_LENGTH]}"
+        )
+        badge = '<span class="status-badge status-active">Active</span>'
+    return (
+        f'<div class="survey-card"><div style="color: white; font-weight: 600;">{escape(survey.question)}</div>'
+        f'<div style="color: #94a3b8; font-size: 0.9rem; margin: 0.5rem 0;">{meta}</div>{badge}</div>'
+    )
+
+def render_survey_cards(surveys, completed=False):
+    """
+    Render a list of survey cards with a single markdown call.
+    
+    Args:
+        surveys (list): Survey tuples in display order
+        completed (bool): Whether to render the completed variant
+    """
+    st.markdown(
+        "".join(survey_card_html(survey, completed) for survey in surveys),
+        unsafe_allow_html=True
+    )
+
+def coalesce_stream(token_iter, flush_ms=16):
+    """
+    Merge streamed text chunks into batches of one flush window each.
+    Feeding the batches to st.write_stream keeps redraws to at most one
+    per window however finely the model splits its output.
+    
+    Args:
+        token_iter (iterable): Iterable of text chunks
+        flush_ms (int): Length of a flush window in milliseconds
+        
+    Yields:
+        str: Concatenated chunks received during one flush window
+    """
+    buffer = []
+    last_flush = time_module.monotonic()
+    for token in token_iter:
+        buffer.append(token)
+        now = time_module.monotonic()
+        if (now - last_flush) * 1000 >= flush_ms:
+            yield "".join(buffer)
+            buffer.clear()
+            last_flush = now
+    if buffer:
+        yield "".join(buffer)
+
+# =============================================================================
+# STATIC PAGE MARKUP
+# =============================================================================
+
+# Introduction under the home page title
+_HERO_INTRO_HTML = """
+<div style='color: #94a3b8; font-size: 1.2rem; line-height: 1.6; margin-bottom: 2rem;'>
+Deploy intelligent AI agents to conduct comprehensive interviews at scale. 
+<span class="gradient-text">Unbiased, adaptive, and deeply analytical.</span>
+</div>
+"""
+
+# Feature highlights, left column
+_FEATURES_LEFT_HTML = """
+<div style='margin: 1.5rem 0;'>
+<div style='color: #a855f7; font-size: 1.5rem;'>🎯</div>
+<div style='color: white; font-weight: 600;'>Smart Probing</div>
+<div style='color: #94a3b8; font-size: 0.9rem;'>Adaptive follow-up questions</div>
+</div>
+<div style='margin: 1.5rem 0;'>
+<div style='color: #a855f7; font-size: 1.5rem;'>⚡</div>
+<div style='color: white; font-weight: 600;'>Real-time Analysis</div>
+<div style='color: #94a3b8; font-size: 0.9rem;'>Instant insights and feedback</div>
+</div>
+"""
+
+# Feature highlights, right column
+_FEATURES_RIGHT_HTML = """
+<div style='margin: 1.5rem 0;'>
+<div style='color: #a855f7; font-size: 1.5rem;'>🌐</div>
+<div style='color: white; font-weight: 600;'>Multi-language</div>
+<div style='color: #94a3b8; font-size: 0.9rem;'>Support for multiple languages</div>
+</div>
+<div style='margin: 1.5rem 0;'>
+<div style='color: #a855f7; font-size: 1.5rem;'>📊</div>
+<div style='color: white; font-weight: 600;'>Rich Analytics</div>
+<div style='color: #94a3b8; font-size: 0.9rem;'>Comprehensive data insights</div>
+</div>
+"""
+
+# Shown in place of the home animation when it is unavailable
+_AI_FALLBACK_HTML = """
+<div style='text-align: center; color: #a855f7; font-size: 8rem;'>🤖</div>
+"""
+
+# Empty state for the active surveys tab
+_EMPTY_ACTIVE_HTML = """
+<div style='text-align: center; padding: 3rem; color: #64748b;'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>📝</div>
+    <h3 style='color: #94a3b8;'>No Active Surveys</h3>
+    <p>Create your first survey to get started!</p>
+</div>
+"""
+
+# Empty state for the completed surveys tab
+_EMPTY_COMPLETED_HTML = """
+<div style='text-align: center; padding: 3rem; color: #64748b;'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>📊</div>
+    <h3 style='color: #94a3b8;'>No Completed Surveys</h3>
+    <p>Complete a survey to see analytics here!</p>
+</div>
+"""
+
+# Confirmation shown after a survey is created
+_SURVEY_CREATED_HTML = """
+<div class="success-container">
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>✅</div>
+    <h3 style='color: #4ade80; margin-bottom: 1rem;'>Survey Created Successfully!</h3>
+    <p style='color: #94a3b8; margin-bottom: 2rem;'>Your survey has been created and is ready to use.</p>
+</div>
+"""
+
+# Tips sidebar on the creation page
+_PRO_TIPS_HTML = """
+<div style='margin-top: 2rem; padding: 1.5rem; background: rgba(30, 30, 46, 0.7); border-radius: 16px; border: 1px solid rgba(255, 255, 255, 0.1);'>
+    <h4 style='color: white; margin-bottom: 1rem;'>💡 Pro Tips</h4>
+    <ul style='color: #94a3b8; padding-left: 1.2rem;'>
+        <li>Be specific with your research question</li>
+        <li>Start with 3-5 follow-up probes</li>
+        <li>Use 60-120 seconds for thoughtful responses</li>
+        <li>Choose appropriate language for your audience</li>
+    </ul>
+</div>
+"""
+
+# Banner shown once an interview is finished
+_COMPLETION_HTML = """
+<div style='text-align: center; padding: 3rem; background: rgba(34, 197, 94, 0.1); border-radius: 16px; border: 1px solid rgba(34, 197, 94, 0.3);'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>🎉</div>
+    <h3 style='color: #4ade80;'>Interview Completed!</h3>
+    <p style='color: #94a3b8;'>Thank you for participating in this research survey.</p>
+</div>
+"""
+
+# Empty state for a conversation with no messages
+_EMPTY_CHAT_HTML = """
+<div style='text-align: center; padding: 3rem; color: #64748b;'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>💬</div>
+    <h3 style='color: #94a3b8;'>Interview Ready</h3>
+    <p>The AI interviewer is prepared. Start the conversation!</p>
+</div>
+"""
 
 # =============================================================================
 # PAGE VIEW FUNCTIONS
@@ -386,59 +1092,31 @@ def view_home():
     
     with col1:
         st.markdown('<h1>AI-Powered Survey Platform</h1>', unsafe_allow_html=True)
-        st.markdown(
-            """
-            <div style='color: #94a3b8; font-size: 1.2rem; line-height: 1.6; margin-bottom: 2rem;'>
-            Deploy intelligent AI agents to conduct comprehensive interviews at scale. 
-            <span class="gradient-text">Unbiased, adaptive, and deeply analytical.</span>
-            </div>
-            """, unsafe_allow_html=True
-        )
+        st.markdown(_HERO_INTRO_HTML, unsafe_allow_html=True)
         
         # Feature highlights in two columns
         features_col1, features_col2 = st.columns(2)
         with features_col1:
-            st.markdown("""
-            <div style='margin: 1.5rem 0;'>
-            <div style='color: #a855f7; font-size: 1.5rem;'>🎯</div>
-            <div style='color: white; font-weight: 600;'>Smart Probing</div>
-            <div style='color: #94a3b8; font-size: 0.9rem;'>Adaptive follow-up questions</div>
-            </div>
-            <div style='margin: 1.5rem 0;'>
-            <div style='color: #a855f7; font-size: 1.5rem;'>⚡</div>
-            <div style='color: white; font-weight: 600;'>Real-time Analysis</div>
-            <div style='color: #94a3b8; font-size: 0.9rem;'>Instant insights and feedback</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_FEATURES_LEFT_HTML, unsafe_allow_html=True)
         
         with features_col2:
-            st.markdown("""
-            <div style='margin: 1.5rem 0;'>
-            <div style='color: #a855f7; font-size: 1.5rem;'>🌐</div>
-            <div style='color: white; font-weight: 600;'>Multi-language</div>
-            <div style='color: #94a3b8; font-size: 0.9rem;'>Support for multiple languages</div>
-            </div>
-            <div style='margin: 1.5rem 0;'>
-            <div style='color: #a855f7; font-size: 1.5rem;'>📊</div>
-            <div style='color: white; font-weight: 600;'>Rich Analytics</div>
-            <div style='color: #94a3b8; font-size: 0.9rem;'>Comprehensive data insights</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_FEATURES_RIGHT_HTML, unsafe_allow_html=True)
         
         # Primary call-to-action button
-        if st.button("🚀 Create New Survey", type="primary", use_container_width=True):
-            st.session_state.create_form_submitted = False
-            st.session_state.survey_created = False
-            navigate("create")
+        st.button(
+            "🚀 Create New Survey",
+            type="primary",
+            use_container_width=True,
+            on_click=start_new_survey
+        )
 
     with col2:
         # Display animation or fallback emoji
+        lottie_ai, _ = get_animations()
         if HAS_LOTTIE and lottie_ai:
             st_lottie(lottie_ai, height=400, key="home_animation")
         else:
-            st.markdown("""
-            <div style='text-align: center; color: #a855f7; font-size: 8rem;'>🤖</div>
-            """, unsafe_allow_html=True)
+            st.markdown(_AI_FALLBACK_HTML, unsafe_allow_html=True)
 
     st.markdown("---")
 
@@ -449,64 +1127,91 @@ def view_home():
     tab_active, tab_done = st.tabs(["🟢 Active Surveys", "🏁 Completed Surveys"])
 
     with tab_active:
-        surveys = backend.get_all_surveys("Incomplete")
+        surveys = get_all_surveys("Incomplete")
         if not surveys:
             # Empty state for no active surveys
-            st.markdown("""
-            <div style='text-align: center; padding: 3rem; color: #64748b;'>
-                <div style='font-size: 4rem; margin-bottom: 1rem;'>📝</div>
-                <h3 style='color: #94a3b8;'>No Active Surveys</h3>
-                <p>Create your first survey to get started!</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_EMPTY_ACTIVE_HTML, unsafe_allow_html=True)
         else:
-            # Display each active survey as an interactive card
-            for survey in surveys:
-                with st.container():
-                    st.markdown('<div class="survey-card">', unsafe_allow_html=True)
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    with col1:
-                        st.markdown(f"**{survey['question']}**")
-                        st.caption(f"📍 Created: {survey['created_at']} • 🔍 Probes: {survey.get('probes', 3)} • ⏱️ Length: {survey.get('length', 60)}s")
-                        st.markdown(f'<span class="status-badge status-active">Active</span>', unsafe_allow_html=True)
-                    with col2:
-                        # Resume survey button
-                        if st.button("▶️ Resume", key=f"res_{survey['id']}", use_container_width=True):
-                            st.session_state.current_survey = survey["id"]
-                            navigate("chat")
-                    with col3:
-                        # Delete survey button
-                        if st.button("🗑️ Delete", key=f"del_{survey['id']}", use_container_width=True):
-                            backend.delete_survey_record(survey["id"])
-                            st.rerun()
-                    st.markdown('</div>', unsafe_allow_html=True)
+            # All cards go out as one block; a single picker drives the actions
+            render_survey_cards(surveys)
+            labels = {survey.id: survey_label(survey) for survey in surveys}
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                # No default, so the actions never target a survey nobody picked
+                selected = st.selectbox(
+                    "Select a survey",
+                    options=list(labels),
+                    format_func=labels.get,
+                    index=None,
+                    placeholder="Select a survey to resume or delete",
+                    key="active_survey_select",
+                    label_visibility="collapsed"
+                )
+            with col2:
+                # Resume survey button
+                st.button(
+                    "▶️ Resume",
+                    key="resume_selected",
+                    use_container_width=True,
+                    disabled=selected is None,
+                    on_click=resume_survey,
+                    args=(selected,)
+                )
+            with col3:
+                # Delete survey button; the survey is removed only after confirmation
+                st.button(
+                    "🗑️ Delete",
+                    key="delete_selected",
+                    use_container_width=True,
+                    disabled=selected is None,
+                    on_click=request_delete,
+                    args=(selected,)
+                )
+            
+            pending = st.session_state.delete_pending
+            if pending in labels:
+                st.warning(f"Delete \"{labels[pending]}\" and its whole transcript? This cannot be undone.")
+                confirm_col, cancel_col = st.columns(2)
+                with confirm_col:
+                    st.button(
+                        "🗑️ Yes, delete",
+                        key="confirm_delete",
+                        type="primary",
+                        use_container_width=True,
+                        on_click=confirm_delete
+                    )
+                with cancel_col:
+                    st.button(
+                        "Cancel",
+                        key="cancel_delete",
+                        use_container_width=True,
+                        on_click=cancel_delete
+                    )
 
     with tab_done:
-        surveys = backend.get_all_surveys("Completed")
+        surveys = get_all_surveys("Completed")
         if not surveys:
             # Empty state for no completed surveys
-            st.markdown("""
-            <div style='text-align: center; padding: 3rem; color: #64748b;'>
-                <div style='font-size: 4rem; margin-bottom: 1rem;'>📊</div>
-                <h3 style='color: #94a3b8;'>No Completed Surveys</h3>
-                <p>Complete a survey to see analytics here!</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_EMPTY_COMPLETED_HTML, unsafe_allow_html=True)
         else:
             # Display completed surveys
-            for survey in surveys:
-                with st.container():
-                    st.markdown('<div class="survey-card">', unsafe_allow_html=True)
-                    col1, col2 = st.columns([4, 1])
-                    with col1:
-                        st.markdown(f"**{survey['question']}**")
-                        st.caption(f"✅ Completed: {survey['created_at']}")
-                        st.markdown(f'<span class="status-badge status-completed">Completed</span>', unsafe_allow_html=True)
-                    with col2:
-                        # View report button (functionality to be implemented)
-                        if st.button("📋 View Report", key=f"view_{survey['id']}", use_container_width=True):
-                            st.session_state.current_survey = survey["id"]
-                    st.markdown('</div>', unsafe_allow_html=True)
+            render_survey_cards(surveys, completed=True)
+            labels = {survey.id: survey_label(survey) for survey in surveys}
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                selected = st.selectbox(
+                    "Select a completed survey",
+                    options=list(labels),
+                    format_func=labels.get,
+                    index=None,
+                    placeholder="Select a survey to view",
+                    key="completed_survey_select",
+                    label_visibility="collapsed"
+                )
+            with col2:
+                # View report button (functionality to be implemented)
+                if st.button("📋 View Report", key="view_selected", use_container_width=True, disabled=selected is None):
+                    st.session_state.current_survey = selected
 
 def view_create():
     """
@@ -520,24 +1225,20 @@ def view_create():
 
         # Show success message if survey was created
         if st.session_state.survey_created:
-            st.markdown("""
-            <div class="success-container">
-                <div style='font-size: 4rem; margin-bottom: 1rem;'>✅</div>
-                <h3 style='color: #4ade80; margin-bottom: 1rem;'>Survey Created Successfully!</h3>
-                <p style='color: #94a3b8; margin-bottom: 2rem;'>Your survey has been created and is ready to use.</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_SURVEY_CREATED_HTML, unsafe_allow_html=True)
             
             # Action buttons after successful creation
             col_start, col_back = st.columns(2)
             with col_start:
-                if st.button("🎤 Start Interview Now", type="primary", use_container_width=True):
-                    navigate("chat")
+                st.button(
+                    "🎤 Start Interview Now",
+                    type="primary",
+                    use_container_width=True,
+                    on_click=navigate,
+                    args=("chat",)
+                )
             with col_back:
-                if st.button("🏠 Back to Dashboard", use_container_width=True):
-                    st.session_state.survey_created = False
-                    st.session_state.create_form_submitted = False
-                    navigate("home")
+                st.button("🏠 Back to Dashboard", use_container_width=True, on_click=leave_create)
         
         else:
             # Survey creation form
@@ -583,19 +1284,19 @@ def view_create():
                     use_container_width=True
                 )
 
-                if submitted:
+                if submitted and accept_create_submit():
                     if question.strip():
                         try:
                             # Create survey in backend and store ID
-                            new_id = backend.create_survey_record(
+                            new_id = create_survey(
                                 question=question,
                                 probes=probes,
                                 length=length,
                                 language=language
                             )
                             st.session_state.current_survey = new_id
+                            st.session_state.show_all = False
                             st.session_state.survey_created = True
-                            st.session_state.create_form_submitted = True
                             st.rerun()
                         except Exception as e:
                             st.error(f"❌ Failed to create survey: {str(e)}")
@@ -604,272 +1305,304 @@ def view_create():
         
     with col2:
         # Visual element and tips sidebar
+        _, lottie_chat = get_animations()
         if HAS_LOTTIE and lottie_chat:
             st_lottie(lottie_chat, height=400)
-        st.markdown("""
-        <div style='margin-top: 2rem; padding: 1.5rem; background: rgba(30, 30, 46, 0.7); border-radius: 16px; border: 1px solid rgba(255, 255, 255, 0.1);'>
-            <h4 style='color: white; margin-bottom: 1rem;'>💡 Pro Tips</h4>
-            <ul style='color: #94a3b8; padding-left: 1.2rem;'>
-                <li>Be specific with your research question</li>
-                <li>Start with 3-5 follow-up probes</li>
-                <li>Use 60-120 seconds for thoughtful responses</li>
-                <li>Choose appropriate language for your audience</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PRO_TIPS_HTML, unsafe_allow_html=True)
+
+def transcribe_recording(backend):
+    """
+    Transcribe the stored voice recording, reporting failures inline.
+    Uses the transcription started when the recording was made, so this
+    usually only collects a finished result.
+    
+    Args:
+        backend (module): Backend module providing transcribe_audio_async
+        
+    Returns:
+        str: Transcribed text, or None if there is nothing usable to send
+    """
+    if not st.session_state.audio_data:
+        return None
+    future = st.session_state.transcription
+    if future is None:
+        future = backend.transcribe_audio_async(st.session_state.audio_data.getvalue())
+    # A failed attempt is not reused if the user sends the recording again
+    st.session_state.transcription = None
+    with st.spinner("🔄 Transcribing..."):
+        try:
+            # Wait for the audio-to-text result
+            transcription = future.result()
+        except Exception as e:
+            st.error(f"Transcription error: {str(e)}")
+            return None
+    if transcription and not transcription.startswith("Error:"):
+        st.session_state.audio_data = None
+        return transcription
+    st.error("Could not transcribe audio. Please try again.")
+    return None
+
+def process_turn(backend, survey, log, user_input, is_audio=False):
+    """
+    Run one interview turn: echo the reply, stream the AI answer, store both.
+    
+    Args:
+        backend (module): Backend module for AI generation
+        survey (Survey): The survey being conducted
+        log (MsgLog): The conversation so far
+        user_input (str): The respondent's reply
+        is_audio (bool): Whether the reply was transcribed from a recording
+    """
+    # Echo the user's message right away, before any backend work
+    with st.chat_message("user"):
+        st.markdown(user_input)
+    with st.chat_message("assistant", avatar="🤖"):
+        reply_container = st.container()
+    
+    # Chunks received so far, so an interrupted turn can still store them
+    streamed = []
+    ai_response = None
+    
+    def record(chunks):
+        for chunk in chunks:
+            streamed.append(chunk)
+            yield chunk
+    
+    try:
+        with st.spinner("🤔 AI interviewer is thinking..."):
+            try:
+                # History as it will read once the user's reply is stored
+                current_messages = log.tail(PROMPT_CONTEXT_MESSAGES) + [
+                    backend.Message(None, survey.id, "user", user_input, is_audio, None)
+                ]
+                
+                # Stream AI response into the page as it is generated
+                ai_stream = backend.generate_ai_response_stream(
+                    messages=current_messages,
+                    user_input=user_input,
+                    survey_question=survey.question,
+                    probes_asked=log.role.count("ai"),
+                    limit=survey.probes
+                )
+                ai_response = reply_container.write_stream(coalesce_stream(record(ai_stream)))
+                ai_response = backend.clean_ai_response(ai_response) or FALLBACK_REPLY
+                    
+            except Exception as e:
+                # Fallback response on error
+                ai_response = FALLBACK_REPLY
+    finally:
+        # A rerun or closed tab stops the script mid-stream with a BaseException;
+        # the reply is stored anyway, with whatever AI text had arrived
+        if ai_response is None:
+            ai_response = backend.clean_ai_response("".join(streamed)) or FALLBACK_REPLY
+        # Store the user's reply and the AI response in a single commit
+        add_messages(survey.id, [("user", user_input, is_audio), ("ai", ai_response, False)])
+
+def render_completion():
+    """
+    Render the interview-completed banner with a way back to the dashboard.
+    """
+    st.markdown(_COMPLETION_HTML, unsafe_allow_html=True)
+    
+    st.button(
+        "🏠 Return to Dashboard",
+        type="primary",
+        use_container_width=True,
+        on_click=navigate,
+        args=("home",)
+    )
+
+@st.fragment
+def render_history(survey_id):
+    """
+    Render the conversation transcript as its own fragment.
+    
+    Args:
+        survey_id (str): The unique survey identifier
+    """
+    log = get_message_log(survey_id)
+    if not log:
+        # Empty state for new conversation
+        st.markdown(_EMPTY_CHAT_HTML, unsafe_allow_html=True)
+    else:
+        # Only the latest messages are rendered until the full history is requested
+        start = 0 if st.session_state.show_all else max(0, len(log) - CHAT_WINDOW)
+        if start:
+            st.button(
+                f"Show {start} earlier messages",
+                key="show_all_history",
+                use_container_width=True,
+                on_click=show_full_history
+            )
+        render_messages(log.role[start:], log.content[start:], log.ts[start:])
+
+@st.fragment
+def chat_input_panel():
+    """
+    Render the text and voice input area as its own fragment.
+    Recording or clearing audio reruns only this panel; a queued response
+    triggers a full run so it is processed alongside the transcript.
+    """
+    # A callback queued a response: hand over to a full run of the page
+    if st.session_state.pending_input or st.session_state.pending_voice:
+        st.rerun()
+
+    st.markdown('<div class="input-container">', unsafe_allow_html=True)
+    
+    # Voice recording indicator
+    if st.session_state.audio_data:
+        st.markdown(
+            '<div class="voice-indicator">🎤 Voice recorded - Ready to send</div>',
+            unsafe_allow_html=True
+        )
+    
+    # Split input area into text and voice sections
+    col_text, col_voice = st.columns([3, 1])
+    
+    with col_text:
+        # Native chat input: sends on Enter and clears itself afterwards
+        st.chat_input("Type your response here...", key="text_input", on_submit=submit_text)
+
+    with col_voice:
+        st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+        
+        # Voice recording input
+        st.audio_input(
+            "Record your voice response", 
+            label_visibility="collapsed",
+            key="voice_input",
+            on_change=store_recording
+        )
+        
+        if st.session_state.audio_data:
+            st.success("✅ Voice recorded!")
+        
+        # Voice action buttons
+        if st.session_state.audio_data:
+            voice_col1, voice_col2 = st.columns(2)
+            with voice_col1:
+                st.button(
+                    "Send Voice",
+                    type="primary",
+                    use_container_width=True,
+                    key="send_voice",
+                    on_click=submit_voice
+                )
+            
+            with voice_col2:
+                st.button("Clear", use_container_width=True, key="clear_voice", on_click=clear_recording)
+        else:
+            st.info("Click to record voice")
+    
+    st.markdown(
+        '<div class="instruction-text">Press Enter to send text or use voice input</div>',
+        unsafe_allow_html=True
+    )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
 
 def view_chat():
     """
     Render the chat interface for conducting AI-powered interviews.
+    Responses queued by the input callbacks are processed in the same run
+    that renders the history, so no render pass is thrown away.
     """
     # Validate current survey session
     if not st.session_state.current_survey:
         navigate("home")
-        return
+        st.rerun()
 
     # Fetch survey data from backend
+    backend = get_backend()
     survey = backend.get_survey_by_id(st.session_state.current_survey)
     if not survey:
         st.error("Session expired or not found.")
         navigate("home")
+        st.rerun()
+
+    # Completed interviews skip the transcript and input entirely
+    if survey.status == "Completed":
+        render_completion()
         return
 
+    # Take the response queued by the last interaction, if any
+    pending_input = st.session_state.pending_input
+    pending_voice = st.session_state.pending_voice
+    st.session_state.pending_input = None
+    st.session_state.pending_voice = False
+
+    # Load the conversation once and derive the stats every section needs
+    log = get_message_log(survey.id)
+    ai_count = log.role.count("ai")
+
     # HEADER SECTION
     col_back, col_title, col_stats = st.columns([1, 3, 1])
     
     with col_back:
-        if st.button("← Back to Dashboard", use_container_width=True):
-            navigate("home")
+        st.button("← Back to Dashboard", use_container_width=True, on_click=navigate, args=("home",))
     
     with col_title:
-        st.markdown(f'<h2>🗣️ {survey["question"]}</h2>', unsafe_allow_html=True)
+        st.markdown(f'<h2>🗣️ {survey.question}</h2>', unsafe_allow_html=True)
         st.caption("Live AI Interview Session")
     
     with col_stats:
-        # Calculate and display probe usage statistics
-        messages = backend.get_messages(survey["id"])
-        ai_messages = [m for m in messages if m["role"] == "ai"]
-        probes_used = max(0, len(ai_messages) - 1)  # Exclude initial question
-        
-        st.markdown(f"""
-        <div style='text-align: center; padding: 0.5rem; background: rgba(30, 30, 46, 0.7); border-radius: 12px;'>
-            <div style='color: #a855f7; font-weight: 600;'>Probes Used</div>
-            <div style='color: white; font-size: 1.5rem; font-weight: 700;'>{probes_used}/{survey["probes"]}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        # Filled in once this run's turn (if any) has been processed
+        stats_slot = st.empty()
 
     st.markdown("---")
 
     # CHAT MESSAGES DISPLAY
-    messages = backend.get_messages(survey["id"])
-    
-    st.markdown('<div class="chat-container">', unsafe_allow_html=True)
-    
-    if not messages:
-        # Empty state for new conversation
-        st.markdown("""
-        <div style='text-align: center; padding: 3rem; color: #64748b;'>
-            <div style='font-size: 4rem; margin-bottom: 1rem;'>💬</div>
-            <h3 style='color: #94a3b8;'>Interview Ready</h3>
-            <p>The AI interviewer is prepared. Start the conversation!</p>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        # Display conversation history
-        for message in messages:
-            if message["role"] == "user":
-                # User message bubble (right-aligned)
-                current_time = time_module.strftime("%m/%d/%y, %I:%M %p")
-                
-                st.markdown(
-                    f"""
-                    <div style='display: flex; justify-content: flex-end; margin: 1rem 0;'>
-                        <div class="user-bubble">
-                            <div style='font-size: 0.8rem; opacity: 0.7; margin-bottom: 0.5rem;'>You</div>
-                            {message['content']}
-                            <div class="message-time">{current_time}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True
-                )
-            else:
-                # AI message bubble (left-aligned)
-                clean_content = re.sub(r'</?div[^>]*>', '', message['content'])
-                clean_content = re.sub(r'<.*?>', '', clean_content)
-                clean_content = clean_content.strip()
-                
-                st.markdown(
-                    f"""
-                    <div style='display: flex; align-items: flex-start; margin: 1rem 0;'>
-                        <div style='font-size: 2rem; margin-right: 0.5rem;'>🤖</div>
-                        <div class="ai-bubble">
-                            <div style='font-size: 0.8rem; opacity: 0.7; margin-bottom: 0.5rem;'>AI Interviewer</div>
-                            {clean_content}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True
-                )
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+    render_history(survey.id)
+
+    # PROCESS QUEUED INPUT AND GENERATE AI RESPONSE
+    if pending_voice:
+        pending_input = transcribe_recording(backend)
+    if pending_input:
+        process_turn(backend, survey, log, pending_input, is_audio=pending_voice)
+        log = get_message_log(survey.id)
+        ai_count = log.role.count("ai")
+
+    probes_used = max(0, ai_count - 1)  # Exclude initial question
+
+    # Display probe usage statistics
+    stats_slot.markdown(f"""
+    <div style='text-align: center; padding: 0.5rem; background: rgba(30, 30, 46, 0.7); border-radius: 12px;'>
+        <div style='color: #a855f7; font-weight: 600;'>Probes Used</div>
+        <div style='color: white; font-size: 1.5rem; font-weight: 700;'>{probes_used}/{survey.probes}</div>
+    </div>
+    """, unsafe_allow_html=True)
 
     # CHECK INTERVIEW COMPLETION STATUS
-    messages = backend.get_messages(survey["id"])
-    ai_messages = [m for m in messages if m["role"] == "ai"]
-    probes_used = max(0, len(ai_messages) - 1)
-    
     interview_complete = False
-    if messages and len(ai_messages) > 0:
-        last_ai_message = ai_messages[-1]["content"].lower()
-        # Check for completion keywords in last AI message
-        if any(word in last_ai_message for word in ["thank you", "complete", "finished", "participation"]):
-            interview_complete = True
-            backend.mark_survey_complete(survey["id"])
+    last_ai_message = log.last("ai")
+    # Check for completion keywords in last AI message
+    if last_ai_message is not None and _DONE_RE.search(last_ai_message) is not None:
+        interview_complete = True
 
     # Show completion screen if interview is finished
-    if interview_complete or probes_used >= survey["probes"]:
-        st.markdown("""
-        <div style='text-align: center; padding: 3rem; background: rgba(34, 197, 94, 0.1); border-radius: 16px; border: 1px solid rgba(34, 197, 94, 0.3);'>
-            <div style='font-size: 4rem; margin-bottom: 1rem;'>🎉</div>
-            <h3 style='color: #4ade80;'>Interview Completed!</h3>
-            <p style='color: #94a3b8;'>Thank you for participating in this research survey.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        if st.button("🏠 Return to Dashboard", type="primary", use_container_width=True):
-            navigate("home")
+    if interview_complete or probes_used >= survey.probes:
+        if survey.status != "Completed":
+            complete_survey(survey.id)
+        render_completion()
             
     else:
         # ACTIVE INTERVIEW INPUT AREA
-        st.markdown('<div class="input-container">', unsafe_allow_html=True)
-        
-        # Voice recording indicator
-        if st.session_state.audio_data:
-            st.markdown(
-                '<div class="voice-indicator">🎤 Voice recorded - Ready to send</div>',
-                unsafe_allow_html=True
-            )
-        
-        # Split input area into text and voice sections
-        col_text, col_voice = st.columns([3, 1])
-        
-        user_input = None  # Will store final user input
-        
-        with col_text:
-            # Text input form
-            with st.form(key='text_input_form', clear_on_submit=True):
-                answer = st.text_area(
-                    "Type your response here...",
-                    height=80,
-                    placeholder="Type your response here...",
-                    label_visibility="collapsed",
-                    key="text_input"
-                )
-                
-                submit_col1, submit_col2 = st.columns([2, 1])
-                with submit_col2:
-                    text_submitted = st.form_submit_button(
-                        "Send Text", 
-                        type="primary", 
-                        use_container_width=True
-                    )
-
-                if text_submitted and answer.strip():
-                    user_input = answer.strip()
-
-        with col_voice:
-            st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
-            
-            # Voice recording input
-            audio = st.audio_input(
-                "Record your voice response", 
-                label_visibility="collapsed",
-                key="voice_input"
-            )
-            
-            if audio:
-                st.session_state.audio_data = audio
-                st.success("✅ Voice recorded!")
-            
-            # Voice action buttons
-            if st.session_state.audio_data:
-                voice_col1, voice_col2 = st.columns(2)
-                with voice_col1:
-                    if st.button("Send Voice", type="primary", use_container_width=True, key="send_voice"):
-                        with st.spinner("🔄 Transcribing..."):
-                            try:
-                                # Transcribe audio to text
-                                transcription = backend.transcribe_audio(st.session_state.audio_data.getvalue())
-                                if transcription and not transcription.startswith("Error:"):
-                                    user_input = transcription
-                                    st.session_state.audio_data = None
-                                    st.success("Voice sent successfully!")
-                                else:
-                                    st.error("Could not transcribe audio. Please try again.")
-                            except Exception as e:
-                                st.error(f"Transcription error: {str(e)}")
-                
-                with voice_col2:
-                    if st.button("Clear", use_container_width=True, key="clear_voice"):
-                        st.session_state.audio_data = None
-                        st.rerun()
-            else:
-                st.info("Click to record voice")
-        
-        st.markdown(
-            '<div class="instruction-text">Press Enter to send text or use voice input</div>',
-            unsafe_allow_html=True
-        )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+        chat_input_panel()
 
         # SESSION INFORMATION PANEL
         with st.expander("📊 Session Information"):
             # Display survey metadata and statistics
             st.markdown("**Research Question**")
-            st.info(survey['question'])
+            st.info(survey.question)
             
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Probes Used", f"{probes_used}/{survey['probes']}")
-                st.metric("Time Limit", f"{survey['length']}s")
+                st.metric("Probes Used", f"{probes_used}/{survey.probes}")
+                st.metric("Time Limit", f"{survey.length}s")
             with col2:
-                st.metric("Language", survey['language'])
+                st.metric("Language", survey.language)
                 st.metric("Status", "Active", delta="Active" if not interview_complete else "Completed")
 
-        # PROCESS USER INPUT AND GENERATE AI RESPONSE
-        if user_input:
-            # Store user message in database
-            backend.add_message(survey["id"], "user", user_input)
-            
-            thinking_placeholder = st.empty()
-            with thinking_placeholder.container():
-                with st.spinner("🤔 AI interviewer is thinking..."):
-                    time_module.sleep(0.5)  # Brief pause for better UX
-                    
-                    try:
-                        # Get updated message history
-                        current_messages = backend.get_messages(survey["id"])
-                        ai_messages_count = len([m for m in current_messages if m["role"] == "ai"])
-                        
-                        # Generate AI response
-                        ai_response = backend.generate_ai_response(
-                            messages=current_messages,
-                            user_input=user_input,
-                            survey_question=survey["question"],
-                            probes_asked=ai_messages_count,
-                            limit=survey["probes"]
-                        )
-                        # Store AI response in database
-                        backend.add_message(survey["id"], "ai", ai_response)
-                            
-                    except Exception as e:
-                        # Fallback response on error
-                        fallback_response = "Thank you for sharing. What would you like to add?"
-                        backend.add_message(survey["id"], "ai", fallback_response)
-            
-            thinking_placeholder.empty()
-            st.rerun()  # Refresh to show new messages
-
 # =============================================================================
 # APPLICATION ROUTER
 # =============================================================================
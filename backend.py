@@ -12,6 +12,22 @@ import speech_recognition as sr
 import io
 import os
 import re
+import hashlib
+import logging
+import queue
+import atexit
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Local speech recognition with faster-whisper (optional dependency)
+try:
+    from faster_whisper import WhisperModel
+    HAS_WHISPER = True
+except ImportError:
+    HAS_WHISPER = False
 
 # =============================================================================
 # CONFIGURATION SECTION
@@ -32,6 +48,14 @@ GEN_CONFIG = genai.GenerationConfig(
     top_k=40                # Limits vocabulary choices for speed
 )
 
+# Tighter budget for the last probe of an interview, where a short question suffices
+FINAL_GEN_CONFIG = genai.GenerationConfig(
+    max_output_tokens=40,
+    temperature=0.7,
+    top_p=0.8,
+    top_k=40
+)
+
 # Safety settings to minimize content filtering
 SAFETY_SETTINGS = [
     {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
@@ -44,54 +68,193 @@ SAFETY_SETTINGS = [
 # DATABASE SETUP
 # =============================================================================
 
-# Create database connection with performance optimizations
-CONN = sqlite3.connect("viva.db", check_same_thread=False)
-# Enable Write-Ahead Logging for better concurrency
-CONN.execute("PRAGMA journal_mode=WAL;")
-# Reduce synchronous writes for better performance
-CONN.execute("PRAGMA synchronous=NORMAL;")
-CURSOR = CONN.cursor()
+_log = logging.getLogger(__name__)
+
+# Database file shared by every connection
+DB_PATH = "viva.db"
+
+# Prepared statements kept per connection; well above the number of distinct queries
+STATEMENT_CACHE_SIZE = 256
+
+# SQL statements used by the data access functions
+_SQL_INSERT_SURVEY = "INSERT INTO surveys VALUES (?, ?, ?, ?, ?, ?, ?)"
+_SQL_INSERT_MSG = "INSERT INTO messages (survey_id, role, content, is_audio, timestamp) VALUES (?, ?, ?, ?, ?)"
+_SQL_GET_SURVEYS = "SELECT * FROM surveys WHERE status=? ORDER BY created_at DESC"
+_SQL_GET_SURVEY = "SELECT * FROM surveys WHERE id=?"
+_SQL_GET_MSGS = "SELECT * FROM messages WHERE survey_id=? ORDER BY id ASC"
+_SQL_MARK_COMPLETE = "UPDATE surveys SET status='Completed' WHERE id=?"
+_SQL_DEL_SURVEY = "DELETE FROM surveys WHERE id=?"
+_SQL_CACHE_GET = "SELECT response FROM response_cache WHERE prompt_key=?"
+_SQL_CACHE_TOUCH = "UPDATE response_cache SET last_used=? WHERE prompt_key=?"
+_SQL_CACHE_PUT = "INSERT OR REPLACE INTO response_cache (prompt_key, response, last_used) VALUES (?, ?, ?)"
+_SQL_CACHE_EVICT = (
+    "DELETE FROM response_cache WHERE prompt_key IN "
+    "(SELECT prompt_key FROM response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)"
+)
+
+# Idle connections shared by every thread. Streamlit runs each script run on a
+# new thread, so connections are pooled rather than tied to the thread that
+# opened them, and their statement and page caches survive between runs
+POOL_SIZE = 8
+_POOL = queue.LifoQueue(maxsize=POOL_SIZE)
+
+def _connect():
+    """
+    Open a database connection with performance optimizations.
+    
+    Returns:
+        sqlite3.Connection: Configured connection
+    """
+    # Pooled connections move between threads, but only one thread uses each at a time
+    conn = sqlite3.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;        -- Write-Ahead Logging: readers don't block the writer
+        PRAGMA synchronous=NORMAL;      -- One fsync per WAL checkpoint instead of per commit
+        PRAGMA temp_store=MEMORY;       -- Keep temporary tables/indices in memory
+        PRAGMA mmap_size=268435456;     -- Read the database through a 256MB memory map
+        PRAGMA cache_size=-65536;       -- Allow a ~64MB page cache
+        PRAGMA foreign_keys=ON;         -- Deleting a survey cascades to its messages
+    """)
+    # Rows support column access by name without rebuilding dicts from the description
+    conn.row_factory = sqlite3.Row
+    return conn
+
+# Row types for the survey and message queries, in table column order
+Survey = namedtuple("Survey", ["id", "question", "probes", "length", "language", "status", "created_at"])
+Message = namedtuple("Message", ["id", "survey_id", "role", "content", "is_audio", "timestamp"])
+
+@contextmanager
+def _cursor(row_type=None):
+    """
+    Borrow a pooled connection for the duration of a with block.
+    A connection is opened when the pool is empty, and closed instead of
+    returned when the pool is full.
+    
+    Args:
+        row_type (type): Optional namedtuple built from each fetched row
+        
+    Yields:
+        sqlite3.Cursor: Cursor on a connection no other thread is using
+    """
+    try:
+        conn = _POOL.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    cursor = conn.cursor()
+    if row_type is not None:
+        # Build the tuple straight from the raw row, skipping sqlite3.Row
+        cursor.row_factory = lambda _cursor, row, make=row_type._make: make(row)
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+        # The next borrower must not inherit a half-finished transaction
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _POOL.put_nowait(conn)
+        except queue.Full:
+            conn.close()
 
 def init_db():
     """
     Initialize database tables for storing surveys and conversation messages.
-    Creates two main tables:
+    Must be called once before any other database operation.
+    Creates three tables:
     - surveys: Stores survey metadata and status
     - messages: Stores all conversation messages between AI and user
+    - response_cache: Stores generated follow-ups for reuse across surveys
+    plus indexes backing get_messages, get_all_surveys and cache eviction.
+    A messages table from before the survey foreign key is rebuilt in place,
+    dropping messages whose survey no longer exists.
     """
-    # Create surveys table if it doesn't exist
-    CURSOR.execute("""
-        CREATE TABLE IF NOT EXISTS surveys (
-            id TEXT PRIMARY KEY,          -- Unique identifier for each survey
-            question TEXT,                -- Main survey question
-            probes INTEGER,               -- Number of follow-up questions allowed
-            length INTEGER,               -- Expected conversation length
-            language TEXT,                -- Language for the conversation
-            status TEXT,                  -- "Incomplete" or "Completed"
-            created_at TEXT               -- Timestamp of survey creation
-        )
-    """)
-    
-    # Create messages table if it doesn't exist
-    CURSOR.execute("""
-        CREATE TABLE IF NOT EXISTS messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Auto-incrementing message ID
-            survey_id TEXT,               -- Links to surveys table
-            role TEXT,                    -- "ai" or "user"
-            content TEXT,                 -- Message content
-            is_audio BOOLEAN,             -- Whether message originated from audio
-            timestamp TEXT                -- When message was created
-        )
-    """)
-    CONN.commit()
-
-# Initialize database on module import
-init_db()
+    with _cursor() as cur:
+        # Detect a messages table created without the ON DELETE CASCADE foreign key
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='messages'")
+        legacy = cur.fetchone() is not None and not cur.execute("PRAGMA foreign_key_list(messages)").fetchall()
+        if legacy:
+            # The whole rebuild runs in one transaction; the old index goes with the old table
+            cur.execute("BEGIN")
+            cur.execute("ALTER TABLE messages RENAME TO messages_legacy")
+        
+        # Create surveys table if it doesn't exist
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS surveys (
+                id TEXT PRIMARY KEY,          -- Unique identifier for each survey
+                question TEXT,                -- Main survey question
+                probes INTEGER,               -- Number of follow-up questions allowed
+                length INTEGER,               -- Expected conversation length
+                language TEXT,                -- Language for the conversation
+                status TEXT,                  -- "Incomplete" or "Completed"
+                created_at TEXT               -- Timestamp of survey creation
+            )
+        """)
+        
+        # Create messages table if it doesn't exist
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Auto-incrementing message ID
+                survey_id TEXT REFERENCES surveys(id) ON DELETE CASCADE,  -- Links to surveys table
+                role TEXT,                    -- "ai" or "user"
+                content TEXT,                 -- Message content
+                is_audio BOOLEAN,             -- Whether message originated from audio
+                timestamp TEXT                -- When message was created
+            )
+        """)
+        
+        if legacy:
+            # Keep message ids; orphans of deleted surveys would violate the foreign key
+            cur.execute("""
+                INSERT INTO messages (id, survey_id, role, content, is_audio, timestamp)
+                SELECT id, survey_id, role, content, is_audio, timestamp FROM messages_legacy
+                WHERE survey_id IN (SELECT id FROM surveys)
+            """)
+            cur.execute("DROP TABLE messages_legacy")
+        
+        # Create response cache table if it doesn't exist
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                prompt_key TEXT PRIMARY KEY,  -- Hash of the normalized prompt
+                response TEXT,                -- Cleaned AI response
+                last_used REAL                -- Epoch seconds of the last hit, for LRU eviction
+            )
+        """)
+        
+        # Index range scans for loading a conversation and listing surveys by status
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_messages_survey ON messages(survey_id, id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_surveys_status ON surveys(status, created_at)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_lru ON response_cache(last_used)")
+        cur.connection.commit()
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+@lru_cache(maxsize=1)
+def _format_second(second):
+    """
+    Format an epoch second as a local "%Y-%m-%d %H:%M:%S" timestamp.
+    
+    Args:
+        second (int): Whole seconds since the epoch
+        
+    Returns:
+        str: Formatted local time
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+
+def _now():
+    """
+    Get the current local timestamp, formatted at most once per second.
+    
+    Returns:
+        str: Current time as "%Y-%m-%d %H:%M:%S"
+    """
+    return _format_second(int(time.time()))
+
+# Precompiled pattern for cleaning AI responses
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+
 def clean_ai_response(response):
     """
     Clean and sanitize AI responses by removing HTML tags and formatting.
@@ -105,27 +268,193 @@ def clean_ai_response(response):
     if not response:
         return response
     
-    # Remove all HTML tags using regex
-    clean_text = re.sub(r'<.*?>', '', response)
-    
-    # Remove specific problematic HTML elements
-    clean_text = re.sub(r'</?div[^>]*>', '', clean_text)
-    clean_text = re.sub(r'</?span[^>]*>', '', clean_text)
-    clean_text = re.sub(r'</?p[^>]*>', '', clean_text)
+    # Remove all HTML tags (div, span, p and any other element) in one pass;
+    # replies without markup skip the regex entirely
+    clean_text = _HTML_TAG_RE.sub('', response) if '<' in response else response
     
     # Normalize whitespace (multiple spaces/tabs/newlines to single space)
-    clean_text = re.sub(r'\s+', ' ', clean_text)
-    clean_text = clean_text.strip()
+    return ' '.join(clean_text.split())
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+# Entries kept before the least recently used ones are evicted
+RESPONSE_CACHE_SIZE = 10_000
+
+# Hits are stamped in memory and written this many at a time, so a lookup stays a read
+CACHE_TOUCH_BATCH = 64
+
+# Eviction walks the LRU index, so it runs on the first insert and then once per
+# this many; in between the table may exceed the cap by fewer rows than this
+CACHE_EVICT_EVERY = 100
+
+# Pending last_used stamps by prompt key, and inserts since the process started
+_CACHE_TOUCHES = {}
+_CACHE_INSERTS = 0
+_CACHE_LOCK = threading.Lock()
+
+# Punctuation is dropped from cache keys so near-identical prompts share an entry
+_CACHE_KEY_RE = re.compile(r'[^\w\s]')
+
+# In-process layer for exact prompt repeats, checked before the SQLite table
+EXACT_CACHE_SIZE = 4096
+_EXACT_CACHE = OrderedDict()
+_EXACT_CACHE_LOCK = threading.Lock()
+
+def _exact_get(prompt):
+    """
+    Look up a response by exact prompt text in the in-process cache.
+    
+    Args:
+        prompt (str): Prompt sent to the model
+        
+    Returns:
+        str: Cached response, or None on a miss or an empty entry
+    """
+    with _EXACT_CACHE_LOCK:
+        response = _EXACT_CACHE.get(prompt)
+        if not response:
+            return None
+        _EXACT_CACHE.move_to_end(prompt)
+        return response
+
+def _exact_put(prompt, response):
+    """
+    Remember a response by exact prompt text, dropping the oldest over the cap.
+    
+    Args:
+        prompt (str): Prompt sent to the model
+        response (str): Cleaned AI response
+    """
+    with _EXACT_CACHE_LOCK:
+        _EXACT_CACHE[prompt] = response
+        _EXACT_CACHE.move_to_end(prompt)
+        if len(_EXACT_CACHE) > EXACT_CACHE_SIZE:
+            _EXACT_CACHE.popitem(last=False)
+
+def _normalize(text):
+    """
+    Normalize text so near-identical prompts or replies compare equal.
     
-    return clean_text
+    Args:
+        text (str): Text to normalize
+        
+    Returns:
+        str: Lowercased text without punctuation or repeated whitespace
+    """
+    return " ".join(_CACHE_KEY_RE.sub(" ", text.lower()).split())
+
+def cache_key(prompt):
+    """
+    Derive the response cache key for a prompt.
+    The normalized prompt is hashed so every key is a short fixed-size
+    string, however much recent context the prompt carries.
+    
+    Args:
+        prompt (str): Prompt sent to the model
+        
+    Returns:
+        str: 32-character hex BLAKE2b digest of the normalized prompt
+    """
+    return hashlib.blake2b(_normalize(prompt).encode(), digest_size=16).hexdigest()
+
+def _take_touches():
+    """
+    Remove and return the pending last_used stamps.
+    
+    Returns:
+        list: (last_used, prompt_key) parameter tuples for _SQL_CACHE_TOUCH
+    """
+    global _CACHE_TOUCHES
+    with _CACHE_LOCK:
+        touches, _CACHE_TOUCHES = _CACHE_TOUCHES, {}
+    return [(last_used, prompt_key) for prompt_key, last_used in touches.items()]
+
+def get_cached_response(prompt_key):
+    """
+    Look up a cached AI response and mark it as recently used.
+    The new last_used stamp is written with a later batch, not per hit.
+    
+    Args:
+        prompt_key (str): Key produced by cache_key
+        
+    Returns:
+        str: Cached response, or None on a miss or an empty entry
+    """
+    with _cursor() as cur:
+        cur.execute(_SQL_CACHE_GET, (prompt_key,))
+        row = cur.fetchone()
+        # Empty replies are never worth serving; treat a stale one as a miss
+        if row is None or not row["response"]:
+            return None
+        with _CACHE_LOCK:
+            _CACHE_TOUCHES[prompt_key] = time.time()
+            full = len(_CACHE_TOUCHES) >= CACHE_TOUCH_BATCH
+        if full:
+            with cur.connection:
+                cur.executemany(_SQL_CACHE_TOUCH, _take_touches())
+        return row["response"]
+
+def store_cached_response(prompt_key, response):
+    """
+    Cache an AI response, evicting the least recently used entries over the cap.
+    Pending hit stamps are written first so eviction sees current recency.
+    
+    Args:
+        prompt_key (str): Key produced by cache_key
+        response (str): Cleaned AI response
+    """
+    global _CACHE_INSERTS
+    with _CACHE_LOCK:
+        evict = _CACHE_INSERTS % CACHE_EVICT_EVERY == 0
+        _CACHE_INSERTS += 1
+    with _cursor() as cur, cur.connection:
+        cur.executemany(_SQL_CACHE_TOUCH, _take_touches())
+        cur.execute(_SQL_CACHE_PUT, (prompt_key, response, time.time()))
+        if evict:
+            cur.execute(_SQL_CACHE_EVICT, (RESPONSE_CACHE_SIZE,))
 
 # =============================================================================
 # AI & SPEECH PROCESSING FUNCTIONS
 # =============================================================================
 
+# Shared recognizer; it holds only settings, so concurrent calls may reuse it
+RECOGNIZER = sr.Recognizer()
+
+# Local Whisper model, loaded on first transcription rather than at import;
+# a failed load is kept so later transcriptions go straight to Google
+_ASR = None
+_ASR_ERROR = None
+_ASR_LOCK = threading.Lock()
+
+# Background workers for blocking speech work, shared by all sessions
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+def _get_asr():
+    """
+    Get the shared local Whisper model, loading it on first use.
+    The load is attempted once; after a failure the model stays unavailable.
+    
+    Returns:
+        WhisperModel: English tiny model with int8 weights on CPU, or None
+            if it could not be loaded
+    """
+    global _ASR, _ASR_ERROR
+    with _ASR_LOCK:
+        if _ASR is None and _ASR_ERROR is None:
+            try:
+                _ASR = WhisperModel("tiny.en", device="cpu", compute_type="int8")
+            except Exception as error:
+                _ASR_ERROR = error
+                _log.exception("Could not load the local Whisper model; using Google Speech Recognition")
+    return _ASR
+
 def transcribe_audio(audio_bytes):
     """
-    Convert speech audio to text using Google Speech Recognition.
+    Convert speech audio to text.
+    Runs locally with faster-whisper when it is installed, and uses
+    Google Speech Recognition otherwise or if the local model fails.
     
     Args:
         audio_bytes (bytes): Audio data in bytes format
@@ -133,14 +462,23 @@ def transcribe_audio(audio_bytes):
     Returns:
         str: Transcribed text or error message if transcription fails
     """
-    recognizer = sr.Recognizer()
+    asr = _get_asr() if HAS_WHISPER else None
+    if asr is not None:
+        try:
+            segments, _ = asr.transcribe(io.BytesIO(audio_bytes), beam_size=1, vad_filter=True)
+            text = " ".join(segment.text.strip() for segment in segments).strip()
+            return text or "Error: Could not understand audio"
+        except Exception:
+            # e.g. audio the decoder can't read; the Google API below gets a try
+            _log.exception("Local transcription failed; falling back to Google Speech Recognition")
+    
     try:
         # Convert bytes to file-like object for speech recognition
         audio_file = io.BytesIO(audio_bytes)
         with sr.AudioFile(audio_file) as source:
-            audio_data = recognizer.record(source) 
-            text = recognizer.recognize_google(audio_data)
-            return text
+            audio_data = RECOGNIZER.record(source)
+        # The file is closed before the network round trip starts
+        return RECOGNIZER.recognize_google(audio_data)
     except sr.UnknownValueError:
         return "Error: Could not understand audio"
     except sr.RequestError:
@@ -148,80 +486,352 @@ def transcribe_audio(audio_bytes):
     except Exception as error:
         return f"Error: {str(error)}"
 
-def generate_ai_response(messages, user_input, survey_question, probes_asked, limit):
+def transcribe_audio_async(audio_bytes):
     """
-    Generate AI responses for survey conversations with optimized performance.
+    Start transcribing audio on a background worker.
+    
+    Args:
+        audio_bytes (bytes): Audio data in bytes format
+        
+    Returns:
+        concurrent.futures.Future: Resolves to the result of transcribe_audio
+    """
+    return _EXECUTOR.submit(transcribe_audio, audio_bytes)
+
+# Prompt templates for the first and later follow-up questions
+_PROMPT_FIRST = "Ask one follow-up about: {u}. Max 10 words."
+_PROMPT_NEXT = "Follow-up on: {u}. {c} Max 10 words."
+_PROMPT_CONTEXT = "Previous: {a} - {b}"
+
+# Fallback responses if AI service is unavailable or slow, rotated by probe count
+_FALLBACKS = (
+    "That's interesting. Can you tell me more?",
+    "What else can you share about that?",
+    "I'd love to hear more details.",
+    "Could you elaborate on that?",
+    "What makes you say that?"
+)
+
+# Inputs made only of these words carry no answer worth a model call
+_FILLER_WORDS = frozenset({"um", "uh", "umm", "uhm", "hmm", "er", "erm", "ah", "mm", "huh"})
+
+# A reply this many edits from the previous one counts as a repeat (e.g. re-sent audio)
+_REPEAT_EDIT_DISTANCE = 3
+# Shorter replies are legitimately similar ("yes", "no"), so they are not compared
+_REPEAT_MIN_WORDS = 3
+
+def _edits_below(a, b, limit):
+    """
+    Check whether two strings are fewer than `limit` single-character edits apart.
+    Only a diagonal band of the Levenshtein table is filled, so the cost is
+    linear in the string length.
+    
+    Args:
+        a (str): First string
+        b (str): Second string
+        limit (int): Edit distance to stay below
+        
+    Returns:
+        bool: True if the edit distance is less than limit
+    """
+    if abs(len(a) - len(b)) >= limit:
+        return False
+    previous = {j: j for j in range(min(len(b), limit - 1) + 1)}
+    for i in range(1, len(a) + 1):
+        current = {}
+        for j in range(max(0, i - limit + 1), min(len(b), i + limit - 1) + 1):
+            if j == 0:
+                current[j] = i
+                continue
+            current[j] = min(
+                previous.get(j, limit) + 1,
+                current.get(j - 1, limit) + 1,
+                previous.get(j - 1, limit) + (a[i - 1] != b[j - 1])
+            )
+        if min(current.values()) >= limit:
+            return False
+        previous = current
+    return previous.get(len(b), limit) < limit
+
+def _is_degenerate(user_input, messages):
+    """
+    Detect replies that should be re-prompted without calling the model.
     
     Args:
-        messages (list): Previous conversation messages
+        user_input (str): Latest user input
+        messages (list): Message tuples, possibly ending with user_input
+        
+    Returns:
+        bool: True for empty, error, filler-only or repeated replies
+    """
+    if not user_input or user_input.startswith("Error:"):
+        return True
+    text = _normalize(user_input)
+    words = text.split()
+    if all(word in _FILLER_WORDS for word in words):
+        return True
+    if len(words) < _REPEAT_MIN_WORDS:
+        return False
+    history = messages[:-1] if messages and messages[-1].role == "user" else messages
+    previous = next((m.content for m in reversed(history) if m.role == "user"), None)
+    return previous is not None and _edits_below(text, _normalize(previous), _REPEAT_EDIT_DISTANCE)
+
+def _chunk_text(chunk):
+    """
+    Extract text from a Gemini response or streamed response chunk.
+    
+    Args:
+        chunk: GenerateContentResponse or one streamed chunk of it
+        
+    Returns:
+        str: Text contained in the chunk, or an empty string if none
+    """
+    try:
+        return chunk.text
+    except ValueError:
+        # Fallback extraction method if primary fails
+        if chunk.candidates and chunk.candidates[0].content.parts:
+            return chunk.candidates[0].content.parts[0].text
+        return ""
+
+def generate_ai_response_stream(messages, user_input, survey_question, probes_asked, limit):
+    """
+    Stream AI responses for survey conversations as they are generated.
+    
+    Chunks are yielded raw so whitespace at chunk boundaries survives;
+    join them and pass the result through clean_ai_response before storing.
+    
+    Args:
+        messages (list): Previous conversation messages as Message tuples
         user_input (str): Latest user input to respond to
         survey_question (str): Original survey question
         probes_asked (int): Number of probes asked so far
         limit (int): Maximum number of probes allowed
         
-    Returns:
-        str: AI-generated response or fallback message
+    Yields:
+        str: Pieces of the AI-generated response, or a single fallback message
     """
+    streamed = False
     try:
         # Calculate actual probes (excluding the initial question)
         actual_probes_asked = max(0, probes_asked - 1)
         
         # Check if interview is complete (reached probe limit)
         if actual_probes_asked >= limit:
-            return "Thank you for your participation! This interview is now complete."
+            yield "Thank you for your participation! This interview is now complete."
+            return
+        
+        # Empty, filler-only or repeated replies get a re-prompt without an API call
+        if _is_degenerate(user_input, messages):
+            yield _FALLBACKS[actual_probes_asked % len(_FALLBACKS)]
+            return
         
         # Generate appropriate prompt based on conversation stage
         if probes_asked == 1:  # First follow-up question
-            prompt = f"Ask one follow-up about: {user_input}. Max 10 words."
+            prompt = _PROMPT_FIRST.format(u=user_input)
         else:
             # For subsequent questions, use recent context for better continuity
             recent_context = ""
             if len(messages) >= 4:  # Ensure we have enough conversation history
-                recent_context = f"Previous: {messages[-2]['content']} - {messages[-1]['content']}"
+                recent_context = _PROMPT_CONTEXT.format(a=messages[-2].content, b=messages[-1].content)
             
-            prompt = f"Follow-up on: {user_input}. {recent_context} Max 10 words."
+            prompt = _PROMPT_NEXT.format(u=user_input, c=recent_context)
+
+        # Reuse the answer to an identical or equivalent prompt instead of calling the model
+        prompt_key = None
+        cached = _exact_get(prompt)
+        if cached is None:
+            prompt_key = cache_key(prompt)
+            try:
+                cached = get_cached_response(prompt_key)
+            except sqlite3.Error:
+                # The cache is optional; a failing lookup counts as a miss
+                _log.exception("Response cache lookup failed")
+            if cached is not None:
+                _exact_put(prompt, cached)
+        if cached is not None:
+            streamed = True
+            yield cached
+            return
+
+        # The final probe gets a smaller output budget
+        config = FINAL_GEN_CONFIG if actual_probes_asked >= limit - 1 else GEN_CONFIG
 
         # Generate AI response with error handling
         try:
             response = MODEL.generate_content(
                 prompt, 
-                generation_config=GEN_CONFIG,
-                safety_settings=SAFETY_SETTINGS
+                generation_config=config,
+                safety_settings=SAFETY_SETTINGS,
+                stream=True
             )
             
-            # Extract text from response with multiple fallback methods
-            try:
-                raw_response = response.text
-            except ValueError:
-                # Fallback extraction method if primary fails
-                if response.candidates and response.candidates[0].content.parts:
-                    raw_response = response.candidates[0].content.parts[0].text
-                else:
-                    raw_response = "Can you tell me more about that?"
+            chunks = []
+            for chunk in response:
+                text = _chunk_text(chunk)
+                if text:
+                    streamed = True
+                    chunks.append(text)
+                    yield text
             
-            # Clean and return the response
-            clean_response = clean_ai_response(raw_response)
-            return clean_response
+            # Markup- or whitespace-only output cleans to nothing; never cache that
+            full_response = clean_ai_response("".join(chunks)) if streamed else ""
+            if full_response:
+                _exact_put(prompt, full_response)
+                try:
+                    store_cached_response(prompt_key, full_response)
+                except sqlite3.Error:
+                    _log.exception("Response cache store failed")
+            else:
+                yield "Can you tell me more about that?"
             
         except Exception as api_error:
-            # Fallback responses if AI service is unavailable or slow
-            fallback_responses = [
-                "That's interesting. Can you tell me more?",
-                "What else can you share about that?",
-                "I'd love to hear more details.",
-                "Could you elaborate on that?",
-                "What makes you say that?"
-            ]
-            return fallback_responses[actual_probes_asked % len(fallback_responses)]
+            # A partial answer is kept as-is rather than glued to a fallback
+            if streamed:
+                return
+            yield _FALLBACKS[actual_probes_asked % len(_FALLBACKS)]
 
     except Exception as error:
-        # Final safety net for any unexpected errors
-        return "Thank you for sharing. What else would you like to add?"
+        # Final safety net for any unexpected errors; worded so the app's
+        # completion check doesn't read it as the end of the interview
+        if not streamed:
+            yield "Could you tell me a bit more about that?"
+
+def generate_ai_response(messages, user_input, survey_question, probes_asked, limit):
+    """
+    Generate AI responses for survey conversations with optimized performance.
+    
+    Args:
+        messages (list): Previous conversation messages as Message tuples
+        user_input (str): Latest user input to respond to
+        survey_question (str): Original survey question
+        probes_asked (int): Number of probes asked so far
+        limit (int): Maximum number of probes allowed
+        
+    Returns:
+        str: AI-generated response or fallback message
+    """
+    chunks = generate_ai_response_stream(messages, user_input, survey_question, probes_asked, limit)
+    return clean_ai_response("".join(chunks))
 
 # =============================================================================
 # DATABASE OPERATIONS
 # =============================================================================
 
+# Attempts at committing a message batch before it is given up as lost; the wait
+# between attempts doubles from the flush window up to the maximum delay (seconds)
+WRITE_RETRIES = 20
+WRITE_RETRY_MAX_DELAY = 1.0
+
+class _MsgBuffer:
+    """
+    Background writer that batches message inserts from all sessions.
+    Each queued item is the list of rows from one call; the items queued
+    within one flush window share a single transaction.
+    """
+
+    def __init__(self, interval=0.05, max_batch=500):
+        self._queue = queue.Queue()
+        self._interval = interval
+        self._max_batch = max_batch
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="viva-msg-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, rows):
+        """
+        Queue message rows for the next batch.
+        
+        Args:
+            rows (list): Parameter tuples for _SQL_INSERT_MSG
+        """
+        if rows:
+            self._queue.put(rows)
+
+    def flush(self):
+        """
+        Block until every queued row has been committed.
+        """
+        # With nothing queued, setting the wake flag would only leave it set
+        # and cut the next caller's flush window short
+        if self._queue.unfinished_tasks == 0:
+            return
+        self._wake.set()  # Cut the current flush window short
+        self._queue.join()
+
+    def _run(self):
+        """
+        Writer loop: collect one window of queued items and commit them together.
+        """
+        while True:
+            items = [self._queue.get()]
+            try:
+                self._wake.wait(self._interval)
+                while len(items) < self._max_batch:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._write(items)
+            except Exception:
+                # An unexpected failure costs this batch, never the writer thread,
+                # or every later flush would wait forever
+                _log.exception("Message writer dropped %d queued item(s)", len(items))
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            # Leave the wake flag set while rows remain, so a flush isn't held another window
+            if self._queue.empty():
+                self._wake.clear()
+
+    def _write(self, items):
+        """
+        Commit a batch in one transaction.
+        Transient errors such as a locked database are retried with backoff.
+        If the batch is rejected as invalid (e.g. rows for a just-deleted
+        survey), each item is committed alone and only the invalid ones are dropped.
+        
+        Args:
+            items (list): Row lists queued by put
+        """
+        pending = list(items)
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with _cursor() as cur:
+                    try:
+                        with cur.connection:
+                            cur.executemany(_SQL_INSERT_MSG, [row for rows in pending for row in rows])
+                        return
+                    except sqlite3.IntegrityError:
+                        pass
+                    # Items leave the list once committed or rejected, so a retry
+                    # after a transient error never inserts one twice
+                    while pending:
+                        try:
+                            with cur.connection:
+                                cur.executemany(_SQL_INSERT_MSG, pending[0])
+                        except sqlite3.IntegrityError as error:
+                            _log.warning(
+                                "Dropped %d message row(s) for survey %s: %s",
+                                len(pending[0]), pending[0][0][0], error
+                            )
+                        pending.pop(0)
+                    return
+            except sqlite3.Error as error:
+                if attempt + 1 == WRITE_RETRIES:
+                    break
+                delay = min(self._interval * 2 ** attempt, WRITE_RETRY_MAX_DELAY)
+                _log.warning("Message write failed (%s), retrying in %.2fs", error, delay)
+                time.sleep(delay)
+        _log.error(
+            "Gave up on %d message row(s) after %d attempts",
+            sum(len(rows) for rows in pending), WRITE_RETRIES
+        )
+
+# Shared message writer; rows still queued at shutdown are committed on exit
+_BUF = _MsgBuffer()
+atexit.register(_BUF.flush)
+
 def create_survey_record(question, probes, length, language):
     """
     Create a new survey record in the database.
@@ -236,21 +846,15 @@ def create_survey_record(question, probes, length, language):
         str: Unique survey ID for the created survey
     """
     survey_id = str(uuid.uuid4())  # Generate unique identifier
-    created_at = time.strftime("%Y-%m-%d %H:%M:%S")  # Current timestamp
+    created_at = _now()  # Current timestamp
     
-    # Insert survey metadata
-    CURSOR.execute(
-        "INSERT INTO surveys VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (survey_id, question, probes, length, language, "Incomplete", created_at)
-    )
-    
-    # Record the initial AI question as first message
-    CURSOR.execute(
-        "INSERT INTO messages (survey_id, role, content, is_audio, timestamp) VALUES (?, ?, ?, ?, ?)",
-        (survey_id, "ai", question, False, created_at)
-    )
-    
-    CONN.commit()
+    # Both rows commit together, or roll back together if either insert fails
+    with _cursor() as cur, cur.connection:
+        # Insert survey metadata
+        cur.execute(_SQL_INSERT_SURVEY, (survey_id, question, probes, length, language, "Incomplete", created_at))
+        
+        # Record the initial AI question as first message
+        cur.execute(_SQL_INSERT_MSG, (survey_id, "ai", question, False, created_at))
     return survey_id
 
 def get_all_surveys(status="Incomplete"):
@@ -261,11 +865,11 @@ def get_all_surveys(status="Incomplete"):
         status (str): Filter surveys by status ("Incomplete" or "Completed")
         
     Returns:
-        list: List of survey dictionaries ordered by creation date (newest first)
+        list: List of Survey tuples ordered by creation date (newest first)
     """
-    CURSOR.execute("SELECT * FROM surveys WHERE status=? ORDER BY created_at DESC", (status,))
-    columns = [desc[0] for desc in CURSOR.description]  # Get column names
-    return [dict(zip(columns, row)) for row in CURSOR.fetchall()]  # Convert to dict
+    with _cursor(Survey) as cur:
+        cur.execute(_SQL_GET_SURVEYS, (status,))
+        return cur.fetchall()
 
 def get_survey_by_id(survey_id):
     """
@@ -275,14 +879,11 @@ def get_survey_by_id(survey_id):
         survey_id (str): The unique survey identifier
         
     Returns:
-        dict: Survey data as dictionary or None if not found
+        Survey: Survey tuple or None if not found
     """
-    CURSOR.execute("SELECT * FROM surveys WHERE id=?", (survey_id,))
-    row = CURSOR.fetchone()
-    if row:
-        columns = [desc[0] for desc in CURSOR.description]
-        return dict(zip(columns, row))
-    return None
+    with _cursor(Survey) as cur:
+        cur.execute(_SQL_GET_SURVEY, (survey_id,))
+        return cur.fetchone()
 
 def get_messages(survey_id):
     """
@@ -292,15 +893,17 @@ def get_messages(survey_id):
         survey_id (str): The unique survey identifier
         
     Returns:
-        list: List of message dictionaries ordered by timestamp
+        list: List of Message tuples ordered by timestamp
     """
-    CURSOR.execute("SELECT * FROM messages WHERE survey_id=? ORDER BY id ASC", (survey_id,))
-    columns = [desc[0] for desc in CURSOR.description]
-    return [dict(zip(columns, row)) for row in CURSOR.fetchall()]
+    _BUF.flush()  # Include messages still waiting in the write buffer
+    with _cursor(Message) as cur:
+        cur.execute(_SQL_GET_MSGS, (survey_id,))
+        return cur.fetchall()
 
 def add_message(survey_id, role, content, is_audio=False):
     """
     Add a new message to the conversation history.
+    The row is committed by the background writer within one flush window.
     
     Args:
         survey_id (str): The unique survey identifier
@@ -308,12 +911,19 @@ def add_message(survey_id, role, content, is_audio=False):
         content (str): The message content
         is_audio (bool): Whether the message originated from audio input
     """
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    CURSOR.execute(
-        "INSERT INTO messages (survey_id, role, content, is_audio, timestamp) VALUES (?, ?, ?, ?, ?)",
-        (survey_id, role, content, is_audio, timestamp)
-    )
-    CONN.commit()
+    _BUF.put([(survey_id, role, content, is_audio, _now())])
+
+def add_messages(survey_id, messages):
+    """
+    Add several messages to the conversation history in one transaction.
+    The rows are committed together by the background writer.
+    
+    Args:
+        survey_id (str): The unique survey identifier
+        messages (list): (role, content, is_audio) triples in conversation order
+    """
+    timestamp = _now()
+    _BUF.put([(survey_id, role, content, is_audio, timestamp) for role, content, is_audio in messages])
 
 def mark_survey_complete(survey_id):
     """
@@ -322,8 +932,10 @@ def mark_survey_complete(survey_id):
     Args:
         survey_id (str): The unique survey identifier to mark as complete
     """
-    CURSOR.execute("UPDATE surveys SET status='Completed' WHERE id=?", (survey_id,))
-    CONN.commit()
+    _BUF.flush()  # The finished transcript is durable before the status changes
+    with _cursor() as cur:
+        cur.execute(_SQL_MARK_COMPLETE, (survey_id,))
+        cur.connection.commit()
 
 def delete_survey_record(survey_id):
     """
@@ -332,6 +944,7 @@ def delete_survey_record(survey_id):
     Args:
         survey_id (str): The unique survey identifier to delete
     """
-    CURSOR.execute("DELETE FROM surveys WHERE id=?", (survey_id,))
-    CURSOR.execute("DELETE FROM messages WHERE survey_id=?", (survey_id,))
-    CONN.commit()
\ No newline at end of file
+    _BUF.flush()  # Queued messages must not land after the cascade
+    # Messages are removed by the ON DELETE CASCADE foreign key
+    with _cursor() as cur, cur.connection:
+        cur.execute(_SQL_DEL_SURVEY, (survey_id,))
\ No newline at end of file